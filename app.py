@@ -4,8 +4,27 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import numpy as np
+import hashlib
+import math
+import os
+import tempfile
 from io import BytesIO
 
+# optional out-of-core backend for exports too large to load into pandas
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# rows per page of the grant details table when reading through DuckDB
+DUCKDB_PAGE_SIZE = 1000
+
+# the export columns the DuckDB backend reads; anything else in the file is left on disk
+DUCKDB_EXPORT_COLUMNS = [
+    'Request: Reference Number', 'Geographical Area Served: Geographical Area Served Name',
+    'Geographic Entity', 'Request: Amount', 'Request: PO'
+]
+
 # page config
 st.set_page_config(
     page_title="Geographic Grant Distribution",
@@ -232,19 +251,12 @@ def get_m49_country_mapping():
     }
 
 @st.cache_data
-def load_and_process_data(grants_file):
+def get_us_region_mapping():
     """
-    Load the grant data and build the hierarchical structure using hardcoded M49 data
+    US states and territories with regional classification
     """
-
-    grants_df = pd.read_csv(grants_file)
-
-    # use hardcoded M49 mapping
-    country_mapping = get_m49_country_mapping()
-
-    # US states with regional classification
     # this might require some tweaks based on how teams think about regions
-    us_regions = {
+    return {
         'South': [
             'Alabama', 'Arkansas', 'Delaware', 'Florida', 'Georgia', 'Kentucky',
             'Louisiana', 'Maryland', 'Mississippi', 'North Carolina', 'Oklahoma',
@@ -269,14 +281,98 @@ def load_and_process_data(grants_file):
         ]
     }
 
-    # create reverse mapping state > region
+def get_state_to_region():
+    """
+    Reverse of the US region mapping: state > region
+    """
     state_to_region = {}
-    for region, states in us_regions.items():
+    for region, states in get_us_region_mapping().items():
         for state in states:
             state_to_region[state] = region
+    return state_to_region
 
-    # US states and territories
-    all_us_entities = [state for states in us_regions.values() for state in states]
+def classify_entity(entity, country_mapping, state_to_region):
+    """
+    Place a single Geographic Entity in the four level hierarchy.
+    Shared by the pandas and DuckDB backends so both classify identically.
+    """
+    if entity == 'United States' or entity in state_to_region:
+        # US branch
+        if entity == 'United States':
+            return {
+                'level1': 'United States',
+                'level2': 'Federal/National',
+                'level3': 'National Programs',
+                'level4': None
+            }
+
+        us_region = state_to_region.get(entity, 'Other US')
+        level4_name = entity if us_region != entity else None
+
+        return {
+            'level1': 'United States',
+            'level2': 'Federal/National',
+            'level3': us_region,
+            'level4': level4_name
+        }
+
+    # international branch
+    m49_info = country_mapping.get(entity)
+
+    if m49_info and pd.notna(m49_info['region']):
+        # recognized country
+        return {
+            'level1': 'International',
+            'level2': m49_info['region'],
+            'level3': m49_info['intermediate_region'] or m49_info['sub_region'],
+            'level4': entity
+        }
+
+    # regional or special entity
+    region = 'Other'
+    sub_region = None
+
+    if 'Africa' in entity or entity == 'Africa':
+        region = 'Africa'
+        if entity in ['Eastern Africa', 'Western Africa', 'Southern Africa', 'Northern Africa']:
+            sub_region = entity
+    elif 'America' in entity or entity in ['Latin America & Caribbean', 'Northern America']:
+        region = 'Americas'
+        if entity == 'Latin America & Caribbean':
+            sub_region = 'Latin America and the Caribbean'
+        elif entity == 'Northern America':
+            sub_region = 'Northern America'
+    elif entity == 'Asia':
+        region = 'Asia'
+    elif entity in ['International', 'Developing Countries']:
+        region = 'Global/Special'
+
+    # plotly wants to duplicate hierarchies sometimes, this avoids that
+    if sub_region and sub_region == entity:
+        level4_name = None
+    elif sub_region:
+        level4_name = entity
+    else:
+        level4_name = entity
+
+    return {
+        'level1': 'International',
+        'level2': region,
+        'level3': sub_region,
+        'level4': level4_name
+    }
+
+@st.cache_data
+def load_and_process_data(grants_file):
+    """
+    Load the grant data and build the hierarchical structure using hardcoded M49 data
+    """
+
+    grants_df = pd.read_csv(grants_file)
+
+    # use hardcoded M49 mapping
+    country_mapping = get_m49_country_mapping()
+    state_to_region = get_state_to_region()
 
     # process each grant to build hierarchy
     categorized_grants = []
@@ -285,71 +381,7 @@ def load_and_process_data(grants_file):
         entity = row['Geographic Entity']
         amount = row['Request: Amount'] or 0
 
-        if entity == 'United States' or entity in all_us_entities:
-            # US branch
-            if entity == 'United States':
-                hierarchy = {
-                    'level1': 'United States',
-                    'level2': 'Federal/National',
-                    'level3': 'National Programs',
-                    'level4': None
-                }
-            else:
-                us_region = state_to_region.get(entity, 'Other US')
-                level4_name = entity if us_region != entity else None
-
-                hierarchy = {
-                    'level1': 'United States',
-                    'level2': 'Federal/National',
-                    'level3': us_region,
-                    'level4': level4_name
-                }
-        else:
-            # international branch
-            m49_info = country_mapping.get(entity)
-
-            if m49_info and pd.notna(m49_info['region']):
-                # recognized country
-                hierarchy = {
-                    'level1': 'International',
-                    'level2': m49_info['region'],
-                    'level3': m49_info['intermediate_region'] or m49_info['sub_region'],
-                    'level4': entity
-                }
-            else:
-                # regional or special entity
-                region = 'Other'
-                sub_region = None
-
-                if 'Africa' in entity or entity == 'Africa':
-                    region = 'Africa'
-                    if entity in ['Eastern Africa', 'Western Africa', 'Southern Africa', 'Northern Africa']:
-                        sub_region = entity
-                elif 'America' in entity or entity in ['Latin America & Caribbean', 'Northern America']:
-                    region = 'Americas'
-                    if entity == 'Latin America & Caribbean':
-                        sub_region = 'Latin America and the Caribbean'
-                    elif entity == 'Northern America':
-                        sub_region = 'Northern America'
-                elif entity == 'Asia':
-                    region = 'Asia'
-                elif entity in ['International', 'Developing Countries']:
-                    region = 'Global/Special'
-
-                # plotly wants to duplicate hierarchies sometimes, this avoids that
-                if sub_region and sub_region == entity:
-                    level4_name = None
-                elif sub_region:
-                    level4_name = entity
-                else:
-                    level4_name = entity
-
-                hierarchy = {
-                    'level1': 'International',
-                    'level2': region,
-                    'level3': sub_region,
-                    'level4': level4_name
-                }
+        hierarchy = classify_entity(entity, country_mapping, state_to_region)
 
         categorized_grants.append({
             **row.to_dict(),
@@ -432,15 +464,19 @@ def build_plotly_hierarchy(df):
 
     return pd.DataFrame(hierarchy_data)
 
-def create_sunburst_chart(hierarchy_df, grants_df):
+def create_sunburst_chart(hierarchy_df):
     """
     Create the interactive Plotly sunburst chart
     """
 
+    # the top level nodes add up to the whole portfolio, so the total comes from the hierarchy
+    # rather than the grant rows (which the DuckDB backend never loads)
+    total_amount = hierarchy_df.loc[hierarchy_df['parents'] == '', 'values'].sum()
+
     # hover text
     hover_text = []
     for _, row in hierarchy_df.iterrows():
-        percentage = (row['values'] / grants_df['amount'].sum()) * 100
+        percentage = (row['values'] / total_amount) * 100
         text = f"<b>{row['labels']}</b><br>"
         text += f"Amount: ${row['values']:,.0f}<br>"
         text += f"Grants: {row['grant_count']}<br>"
@@ -463,7 +499,7 @@ def create_sunburst_chart(hierarchy_df, grants_df):
     # custom chart config to increase size
     fig.update_layout(
         title={
-            'text': f'Geographic Grant Distribution<br><span style="font-size: 24px; color: #27ae60;">Total: ${grants_df["amount"].sum():,.0f}</span>',
+            'text': f'Geographic Grant Distribution<br><span style="font-size: 24px; color: #27ae60;">Total: ${total_amount:,.0f}</span>',
             'x': 0.5,
             'xanchor': 'center',
             'font': {'size': 36}
@@ -483,55 +519,339 @@ def filter_data_by_selection(df, selected_path):
     if not selected_path:
         return df
 
-    # parse the selected path
-    path_parts = selected_path.split('/')
-
-    # filter conditions
-    conditions = pd.Series([True] * len(df))
+    # match against the node ids each row rolls up into rather than splitting the path,
+    # since some labels (e.g. 'Global/Special') contain a slash themselves
+    conditions = pd.Series(False, index=df.index)
+    node_id = pd.Series('', index=df.index)
+    valid = pd.Series(True, index=df.index)
 
-    if len(path_parts) >= 1 and path_parts[0]:
-        conditions &= (df['level1'] == path_parts[0])
-    if len(path_parts) >= 2 and path_parts[1]:
-        conditions &= (df['level2'] == path_parts[1])
-    if len(path_parts) >= 3 and path_parts[2]:
-        conditions &= (df['level3'] == path_parts[2])
-    if len(path_parts) >= 4 and path_parts[3]:
-        conditions &= (df['level4'] == path_parts[3])
+    for depth, level in enumerate(['level1', 'level2', 'level3', 'level4']):
+        valid &= df[level].notna()
+        label = df[level].where(valid, '').astype(str)
+        node_id = label if depth == 0 else node_id + '/' + label
+        conditions |= valid & (node_id == selected_path)
 
     return df[conditions]
 
-def create_summary_stats(df):
+def summarize_selection(df):
     """
-    Create summary statistics for the filtered data
+    Summary statistics and top 5 lists for the filtered data
     """
-    total_amount = df['amount'].sum()
-    total_grants = len(df)
-    avg_grant = df['amount'].mean()
+    return {
+        'total_amount': df['amount'].sum(),
+        'total_grants': len(df),
+        'avg_grant': df['amount'].mean(),
+        'unique_entities': df['Geographic Entity'].nunique(),
+        'top_entities': df.groupby('Geographic Entity')['amount'].sum().sort_values(ascending=False).head(5),
+        'top_program_officers': df.groupby('Request: PO')['amount'].sum().sort_values(ascending=False).head(5),
+    }
 
+def create_summary_stats(summary):
+    """
+    Create summary statistics for the filtered data
+    """
     col1, col2, col3 = st.columns(3)
 
     with col1:
         st.metric(
             label="Total Amount",
-            value=f"${total_amount:,.0f}",
-            delta=f"{len(df)} grants"
+            value=f"${summary['total_amount']:,.0f}",
+            delta=f"{summary['total_grants']} grants"
         )
 
     with col2:
         st.metric(
             label="Average Grant Size",
-            value=f"${avg_grant:,.0f}",
+            value=f"${summary['avg_grant']:,.0f}",
             delta=None
         )
 
     with col3:
-        unique_entities = df['Geographic Entity'].nunique()
         st.metric(
             label="Geographic Entities",
-            value=unique_entities,
+            value=summary['unique_entities'],
             delta=None
         )
 
+# out-of-core backend
+# large exports are read from local disk by DuckDB, which only returns the hierarchy table,
+# the selection summary and the page of rows being viewed
+def sql_string(value):
+    """
+    Quote a value as a SQL string literal, for the places DuckDB does not accept parameters (e.g. file paths)
+    """
+    return "'" + str(value).replace("'", "''") + "'"
+
+def resolve_grants_path(grants_path):
+    """
+    Resolve a path typed in the sidebar to an export inside GRANTS_DATA_DIR.
+    Symlinks and '..' are resolved before the check, so the box can't be used to read other files on the server.
+    Raises ValueError with a message that is safe to show to the user.
+    """
+    data_dir = os.environ.get('GRANTS_DATA_DIR')
+    if not data_dir:
+        raise ValueError("Reading exports from disk is not enabled on this server.")
+
+    data_dir = os.path.realpath(data_dir)
+    resolved_path = os.path.realpath(os.path.join(data_dir, grants_path))
+
+    if (
+        os.path.commonpath([data_dir, resolved_path]) != data_dir
+        or not resolved_path.lower().endswith(('.csv', '.parquet'))
+        or not os.path.isfile(resolved_path)
+    ):
+        raise ValueError("Export not found. Enter the name of a CSV or Parquet file in the data directory.")
+
+    return resolved_path
+
+def get_source_version(grants_path):
+    """
+    Modification time and size of an export, which together key its staged copy.
+    The size catches a replacement that kept the old mtime (cp -p, rsync -a, coarse timestamps).
+    """
+    stat = os.stat(grants_path)
+    return stat.st_mtime_ns, stat.st_size
+
+def get_grants_cache_dir():
+    """
+    Folder for the Parquet copies of CSV exports: GRANTS_CACHE_DIR if set, otherwise a per-user
+    folder in the system temp directory that only this user can read or write.
+    """
+    cache_dir = os.environ.get('GRANTS_CACHE_DIR')
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        return cache_dir
+
+    uid = os.getuid() if hasattr(os, 'getuid') else os.getlogin()
+    cache_dir = os.path.join(tempfile.gettempdir(), f"grant_geo_explorer-{uid}")
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+
+    # the name is predictable, so refuse a folder someone else made or left open
+    if not is_own_file(cache_dir) or os.stat(cache_dir).st_mode & 0o077:
+        raise PermissionError(f"Cache folder {cache_dir} is not private to this user. Set GRANTS_CACHE_DIR instead.")
+
+    return cache_dir
+
+def is_own_file(path):
+    """
+    Whether path exists and belongs to the user running the app
+    """
+    if not os.path.exists(path):
+        return False
+    return not hasattr(os, 'getuid') or os.stat(path).st_uid == os.getuid()
+
+@st.cache_data
+def stage_grants_source(grants_path, source_version):
+    """
+    One-off preparation of an export for the out-of-core backend, cached per file version.
+    A CSV is converted to Parquet in the cache directory so each click scans compressed columns
+    instead of re-parsing the text, and the distinct entities are classified here rather than per query.
+    Returns the path to query and the small entity classification table.
+    """
+    if duckdb is None:
+        raise ImportError("The out-of-core backend needs DuckDB. Install with: pip install duckdb")
+
+    staged_path = str(grants_path)
+
+    with duckdb.connect() as con:
+        if not staged_path.lower().endswith('.parquet'):
+            cache_key = hashlib.sha1(f"{os.path.realpath(grants_path)}:{source_version}".encode()).hexdigest()
+            staged_path = os.path.join(get_grants_cache_dir(), f"{cache_key}.parquet")
+
+            # a previous run may already have converted this version of the file,
+            # but only trust a copy this process's user wrote
+            if not is_own_file(staged_path):
+                partial_path = f"{staged_path}.{os.getpid()}.tmp"
+                export_columns = ', '.join(
+                    f'CAST("{column}" AS DOUBLE) AS "{column}"' if column == 'Request: Amount' else f'"{column}"'
+                    for column in DUCKDB_EXPORT_COLUMNS
+                )
+                try:
+                    # column types are not guessed from a sample of rows: a guessed integer amount column
+                    # would round a later 1500.40 to 1500, and a late odd value would fail the whole copy
+                    con.execute(f"""
+                        COPY (
+                            SELECT {export_columns}
+                            FROM read_csv({sql_string(grants_path)}, all_varchar = true)
+                        ) TO {sql_string(partial_path)} (FORMAT PARQUET)
+                    """)
+                    os.replace(partial_path, staged_path)
+                except duckdb.ConversionException:
+                    raise ValueError("Every 'Request: Amount' value must be a number or left blank.")
+                finally:
+                    if os.path.exists(partial_path):
+                        os.remove(partial_path)
+
+        # the distinct entity list is small even when the export is not
+        entities = [
+            entity for (entity,) in con.execute(
+                f'SELECT DISTINCT "Geographic Entity" FROM read_parquet({sql_string(staged_path)})'
+            ).fetchall()
+            if entity is not None
+        ]
+
+    country_mapping = get_m49_country_mapping()
+    state_to_region = get_state_to_region()
+    entity_levels = pd.DataFrame(
+        [{'Geographic Entity': entity, **classify_entity(entity, country_mapping, state_to_region)} for entity in entities],
+        columns=['Geographic Entity', 'level1', 'level2', 'level3', 'level4']
+    )
+
+    return staged_path, entity_levels
+
+def connect_grants_source(grants_path, source_version):
+    """
+    Open an in-memory DuckDB connection with a processed_grants view over a local CSV or Parquet export.
+    The staged file stays on disk: DuckDB streams it through each query, so memory is bounded by the result size.
+    The cached entity classification is joined back inside the database.
+    """
+    staged_path, entity_levels = stage_grants_source(grants_path, source_version)
+
+    # the cached staging result outlives its Parquet copy if someone clears out the cache folder
+    if not os.path.exists(staged_path):
+        stage_grants_source.clear(grants_path, source_version)
+        staged_path, entity_levels = stage_grants_source(grants_path, source_version)
+
+    con = duckdb.connect()
+
+    # a malformed file fails here, so don't leave the connection open behind the exception
+    try:
+        con.register('entity_levels', entity_levels)
+
+        # only the export columns the app uses, so an export that already has e.g. an 'amount'
+        # or 'level1' column can't clash with the ones added here
+        export_columns = ', '.join(f'g."{column}"' for column in DUCKDB_EXPORT_COLUMNS)
+
+        con.execute(f"""
+            CREATE VIEW processed_grants AS
+            SELECT
+                {export_columns},
+                CAST(e.level1 AS VARCHAR) AS level1,
+                CAST(e.level2 AS VARCHAR) AS level2,
+                CAST(e.level3 AS VARCHAR) AS level3,
+                CAST(e.level4 AS VARCHAR) AS level4,
+                CAST(g."Request: Amount" AS DOUBLE) AS amount
+            FROM read_parquet({sql_string(staged_path)}) g
+            LEFT JOIN entity_levels e ON g."Geographic Entity" = e."Geographic Entity"
+        """)
+    except Exception:
+        con.close()
+        raise
+
+    return con
+
+def selection_condition(selected_path):
+    """
+    SQL condition and parameters matching the rows under a sunburst id, mirroring filter_data_by_selection.
+    Concatenating a NULL level gives NULL, so rows that stop above a node never match it.
+    """
+    if not selected_path:
+        return 'TRUE', []
+
+    node_ids = [
+        "level1",
+        "level1 || '/' || level2",
+        "level1 || '/' || level2 || '/' || level3",
+        "level1 || '/' || level2 || '/' || level3 || '/' || level4",
+    ]
+    return ' OR '.join(f"({node_id}) = ?" for node_id in node_ids), [selected_path] * len(node_ids)
+
+@st.cache_data
+def build_plotly_hierarchy_duckdb(grants_path, source_version):
+    """
+    Out-of-core version of build_plotly_hierarchy for exports read from disk.
+    All four levels are aggregated in a single scan with GROUPING SETS; only the small result is loaded.
+    source_version is only part of the cache key, so a replaced file is re-read.
+    """
+    with connect_grants_source(grants_path, source_version) as con:
+        grouped = con.execute("""
+            SELECT
+                level1, level2, level3, level4,
+                GROUPING(level2) + GROUPING(level3) + GROUPING(level4) AS rolled_up,
+                COALESCE(SUM(amount), 0) AS amount,
+                COUNT("Request: Reference Number") AS grant_count
+            FROM processed_grants
+            WHERE level1 IS NOT NULL
+            GROUP BY GROUPING SETS ((level1), (level1, level2), (level1, level2, level3), (level1, level2, level3, level4))
+        """).df()
+
+    hierarchy_data = []
+    levels = ['level1', 'level2', 'level3', 'level4']
+
+    for depth in range(1, len(levels) + 1):
+        # same rules as the pandas backend: a node needs every level above it to be set
+        level_groups = grouped[grouped['rolled_up'] == len(levels) - depth]
+        level_groups = level_groups.dropna(subset=levels[:depth]).sort_values(levels[:depth])
+
+        for _, row in level_groups.iterrows():
+            path = [row[level] for level in levels[:depth]]
+            hierarchy_data.append({
+                'ids': '/'.join(path),
+                'labels': path[-1],
+                'parents': '/'.join(path[:-1]),
+                'values': row['amount'],
+                'grant_count': row['grant_count']
+            })
+
+    return pd.DataFrame(hierarchy_data, columns=['ids', 'labels', 'parents', 'values', 'grant_count'])
+
+@st.cache_data
+def summarize_selection_duckdb(grants_path, source_version, selected_path):
+    """
+    Out-of-core version of summarize_selection, computed in the database
+    """
+    condition, params = selection_condition(selected_path)
+
+    with connect_grants_source(grants_path, source_version) as con:
+        # totals and both top 5 lists in a single pass over the selection
+        grouped = con.execute(f"""
+            SELECT
+                "Geographic Entity", "Request: PO",
+                GROUPING("Geographic Entity") AS all_entities,
+                GROUPING("Request: PO") AS all_program_officers,
+                COALESCE(SUM(amount), 0) AS amount,
+                COUNT(*) AS grant_count,
+                AVG(amount) AS avg_grant,
+                COUNT(DISTINCT "Geographic Entity") AS unique_entities
+            FROM processed_grants
+            WHERE {condition}
+            GROUP BY GROUPING SETS ((), ("Geographic Entity"), ("Request: PO"))
+        """, params).df()
+
+    totals = grouped[(grouped['all_entities'] == 1) & (grouped['all_program_officers'] == 1)].iloc[0]
+    by_entity = grouped[(grouped['all_entities'] == 0) & grouped['Geographic Entity'].notna()]
+    by_program_officer = grouped[(grouped['all_program_officers'] == 0) & grouped['Request: PO'].notna()]
+
+    summary = {
+        'total_amount': totals['amount'],
+        'total_grants': int(totals['grant_count']),
+        'avg_grant': totals['avg_grant'] if pd.notna(totals['avg_grant']) else np.nan,
+        'unique_entities': int(totals['unique_entities']),
+        'top_entities': by_entity.set_index('Geographic Entity')['amount'].sort_values(ascending=False).head(5),
+        'top_program_officers': by_program_officer.set_index('Request: PO')['amount'].sort_values(ascending=False).head(5),
+    }
+
+    return summary
+
+@st.cache_data
+def load_selection_page_duckdb(grants_path, source_version, selected_path, page, page_size=DUCKDB_PAGE_SIZE):
+    """
+    Load one page of the rows under the selected sunburst id, for the grant details table
+    """
+    condition, params = selection_condition(selected_path)
+
+    with connect_grants_source(grants_path, source_version) as con:
+        return con.execute(f"""
+            SELECT
+                "Geographic Entity", "Request: Amount", "Request: PO", "Request: Reference Number",
+                "Geographical Area Served: Geographical Area Served Name",
+                level1, level2, level3, level4, amount
+            FROM processed_grants
+            WHERE {condition}
+            ORDER BY "Request: Reference Number", "Geographical Area Served: Geographical Area Served Name"
+            LIMIT ? OFFSET ?
+        """, params + [page_size, (page - 1) * page_size]).df()
+
 def to_excel(df):
     """
     Convert dataframe to Excel for download.
@@ -557,6 +877,29 @@ def main():
         help="Upload your grant portfolio CSV file"
     )
 
+    # only offered when the server has a data directory to read from
+    grants_path = None
+    if duckdb is not None and os.environ.get('GRANTS_DATA_DIR'):
+        grants_path = st.sidebar.text_input(
+            "Or Read a Large Export From Disk",
+            placeholder="grants_since_2000.parquet",
+            help="Name of a CSV or Parquet file in the server's data directory. It is aggregated with DuckDB without loading it into memory."
+        ).strip()
+
+        if grants_path:
+            try:
+                grants_path = resolve_grants_path(grants_path)
+            except ValueError as e:
+                st.sidebar.error(str(e))
+                grants_path = None
+
+    # the path takes precedence, so say so rather than silently ignoring the upload
+    if grants_path and grants_file is not None:
+        st.sidebar.warning(
+            f"Showing **{os.path.basename(grants_path)}** from the data directory, not the uploaded file. "
+            "Clear the path to use the upload."
+        )
+
     st.sidebar.markdown("---")
     st.sidebar.markdown("""
     **Geographic Classifications**
@@ -571,19 +914,24 @@ def main():
     • Oceania
     """)
 
-    if grants_file is not None:
+    if grants_file is not None or grants_path:
         try:
             # load and process data
             with st.spinner('Processing data...'):
-                processed_df = load_and_process_data(grants_file)
-                hierarchy_df = build_plotly_hierarchy(processed_df)
+                if grants_path:
+                    # out-of-core: only the hierarchy table is brought into memory
+                    source_version = get_source_version(grants_path)
+                    hierarchy_df = build_plotly_hierarchy_duckdb(grants_path, source_version)
+                else:
+                    processed_df = load_and_process_data(grants_file)
+                    hierarchy_df = build_plotly_hierarchy(processed_df)
 
             # initialize session state for selections
             if 'selected_path' not in st.session_state:
                 st.session_state.selected_path = None
 
             # create and display the sunburst chart - full width
-            fig = create_sunburst_chart(hierarchy_df, processed_df)
+            fig = create_sunburst_chart(hierarchy_df)
 
             # display chart with click handling - full container width
             selected_data = st.plotly_chart(
@@ -607,23 +955,36 @@ def main():
                     st.session_state.selected_path = None
                     st.rerun()
 
-            # filter data based on selection
             if st.session_state.selected_path:
-                filtered_df = filter_data_by_selection(processed_df, st.session_state.selected_path)
                 section_title = f"Grants in: {st.session_state.selected_path.split('/')[-1]}"
             else:
-                filtered_df = processed_df
                 section_title = "All Grants"
 
+            # filter data based on selection
+            if grants_path:
+                summary = summarize_selection_duckdb(grants_path, source_version, st.session_state.selected_path)
+            elif st.session_state.selected_path:
+                filtered_df = filter_data_by_selection(processed_df, st.session_state.selected_path)
+                summary = summarize_selection(filtered_df)
+            else:
+                filtered_df = processed_df
+                summary = summarize_selection(filtered_df)
+
             st.markdown("---")
 
             # summary stats
             st.subheader(f"Summary Statistics - {section_title}")
-            create_summary_stats(filtered_df)
+            create_summary_stats(summary)
 
             # filtered data table
             st.subheader(f"Grant Details - {section_title}")
 
+            if grants_path:
+                # only the page being viewed is loaded from disk
+                page_count = max(math.ceil(summary['total_grants'] / DUCKDB_PAGE_SIZE), 1)
+                page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1)
+                filtered_df = load_selection_page_duckdb(grants_path, source_version, st.session_state.selected_path, page)
+
             # prepare display columns
             display_columns = [
                 'Geographic Entity', 'Request: Amount', 'Request: PO',
@@ -648,27 +1009,29 @@ def main():
             )
 
             # additional insights
-            if len(filtered_df) > 0:
+            if summary['total_grants'] > 0:
                 st.subheader("Quick Insights")
 
                 col1, col2 = st.columns(2)
 
                 with col1:
                     # top entities by amount
-                    top_entities = filtered_df.groupby('Geographic Entity')['amount'].sum().sort_values(ascending=False).head(5)
                     st.write("**Top 5 Entities by Amount:**")
-                    for entity, amount in top_entities.items():
+                    for entity, amount in summary['top_entities'].items():
                         st.write(f"• {entity}: ${amount:,.0f}")
 
                 with col2:
                     # PO distribution
-                    po_distribution = filtered_df.groupby('Request: PO')['amount'].sum().sort_values(ascending=False).head(5)
                     st.write("**Top 5 Program Officers by Amount:**")
-                    for po, amount in po_distribution.items():
+                    for po, amount in summary['top_program_officers'].items():
                         st.write(f"• {po}: ${amount:,.0f}")
 
         except Exception as e:
-            st.error(f"Error processing data: {str(e)}")
+            if grants_path and not isinstance(e, ValueError):
+                # DuckDB errors can quote the file's contents, so keep them off the page
+                st.error("Error processing data: this file could not be read as a grant export.")
+            else:
+                st.error(f"Error processing data: {str(e)}")
             st.write("Please make sure your files are in the correct format.")
 
     else:
@@ -0,0 +1,22 @@
+"""
+Shared fixtures for the pipeline tests
+"""
+import pytest
+
+from pipeline_helpers import make_grants_csv
+
+
+@pytest.fixture(scope='session', autouse=True)
+def grants_cache_dir(tmp_path_factory):
+    """
+    Keep the Parquet files staged by the DuckDB backend out of the shared temp directory
+    """
+    cache_dir = tmp_path_factory.mktemp('grants_cache')
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('GRANTS_CACHE_DIR', str(cache_dir))
+        yield cache_dir
+
+
+@pytest.fixture(scope='session')
+def synthetic_large():
+    return make_grants_csv(50_000, seed=2025)
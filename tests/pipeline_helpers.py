@@ -0,0 +1,71 @@
+"""
+Helpers shared by the pipeline tests: the undecorated app functions and synthetic exports.
+Importing app runs st.set_page_config and the st.cache_data decorators in bare mode, so no
+Streamlit server is needed. Tests call the undecorated functions via __wrapped__ so that
+caching never hides a regression.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+# streamlit logs a warning per cached function when imported outside a script run
+logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+import app  # noqa: E402
+
+load_and_process_data = app.load_and_process_data.__wrapped__
+build_plotly_hierarchy = app.build_plotly_hierarchy.__wrapped__
+filter_data_by_selection = app.filter_data_by_selection
+summarize_selection = app.summarize_selection
+build_plotly_hierarchy_duckdb = app.build_plotly_hierarchy_duckdb.__wrapped__
+summarize_selection_duckdb = app.summarize_selection_duckdb.__wrapped__
+load_selection_page_duckdb = app.load_selection_page_duckdb.__wrapped__
+stage_grants_source = app.stage_grants_source.__wrapped__
+get_source_version = app.get_source_version
+get_grants_cache_dir = app.get_grants_cache_dir
+resolve_grants_path = app.resolve_grants_path
+
+US_ENTITIES = ['United States', 'California', 'Texas', 'New York', 'Illinois', 'Puerto Rico', 'South']
+REGIONAL_ENTITIES = [
+    'Africa', 'Eastern Africa', 'Western Africa', 'Latin America & Caribbean', 'Northern America',
+    'South America', 'Asia', 'International', 'Developing Countries', 'Atlantis'
+]
+PROGRAM_OFFICERS = ['A. Alvarez', 'B. Baker', 'C. Chen', 'D. Diallo']
+
+
+def make_grants_csv(n_rows, seed=0):
+    """
+    Build the text of a synthetic GMS export covering every branch of the classification logic:
+    US states, M49 countries, regional/special entities and unknown names, plus some blank amounts.
+    """
+    rng = np.random.default_rng(seed)
+    countries = sorted(app.get_m49_country_mapping().keys())
+    entities = np.array(US_ENTITIES + REGIONAL_ENTITIES + countries, dtype=object)
+
+    amounts = rng.integers(1, 500, size=n_rows) * 1000.0
+    amounts[rng.random(n_rows) < 0.02] = np.nan
+
+    grants_df = pd.DataFrame({
+        'Request: Reference Number': [f"{2000000 + i // 3}-{i % 3}" for i in range(n_rows)],
+        'Geographical Area Served: Geographical Area Served Name': [f"GAS-{i:07d}" for i in range(n_rows)],
+        'Geographic Entity': entities[rng.integers(0, len(entities), size=n_rows)],
+        'Request: Amount': amounts,
+        'Request: PO': rng.choice(PROGRAM_OFFICERS, size=n_rows),
+    })
+
+    return grants_df.to_csv(index=False)
+
+
+def terminal_amount(processed_df, node_id):
+    """
+    Amount from rows whose path stops at node_id, i.e. that roll up into it but into none of its children
+    """
+    path = processed_df['level1'].astype(str)
+    depth_of_row = pd.Series(1, index=processed_df.index)
+    for depth, level in enumerate(['level2', 'level3', 'level4'], start=2):
+        has_level = processed_df[level].notna() & (depth_of_row == depth - 1)
+        path = path.where(~has_level, path + '/' + processed_df[level].astype(str))
+        depth_of_row = depth_of_row.where(~has_level, depth)
+
+    return processed_df.loc[path == node_id, 'amount'].sum()
@@ -0,0 +1,188 @@
+"""
+The DuckDB backend must report exactly what the pandas backend reports for the same export
+"""
+import os
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from pipeline_helpers import (
+    app, build_plotly_hierarchy, build_plotly_hierarchy_duckdb, filter_data_by_selection, get_grants_cache_dir,
+    get_source_version, load_and_process_data, load_selection_page_duckdb, make_grants_csv, stage_grants_source,
+    summarize_selection, summarize_selection_duckdb
+)
+
+pytest.importorskip('duckdb')
+
+SAMPLE_EXPORT = Path(__file__).parent / 'data' / 'sample_export.csv'
+
+
+@pytest.fixture(scope='module', params=['sample.csv', 'synthetic.csv', 'synthetic.parquet'])
+def exports(request, tmp_path_factory):
+    """
+    The same export as a pandas frame and as a file on disk for DuckDB
+    """
+    csv_text = SAMPLE_EXPORT.read_text() if request.param == 'sample.csv' else make_grants_csv(5_000, seed=7)
+    grants_path = tmp_path_factory.mktemp('exports') / request.param
+
+    if grants_path.suffix == '.parquet':
+        pd.read_csv(StringIO(csv_text)).to_parquet(grants_path)
+    else:
+        grants_path.write_text(csv_text)
+
+    return load_and_process_data(StringIO(csv_text)), str(grants_path), get_source_version(grants_path)
+
+
+def test_hierarchy_matches_pandas(exports):
+    processed_df, grants_path, source_version = exports
+    expected_df = build_plotly_hierarchy(processed_df)
+    actual_df = build_plotly_hierarchy_duckdb(grants_path, source_version)
+
+    assert actual_df['ids'].tolist() == expected_df['ids'].tolist()
+    assert actual_df['labels'].tolist() == expected_df['labels'].tolist()
+    assert actual_df['parents'].tolist() == expected_df['parents'].tolist()
+    assert actual_df['values'].tolist() == pytest.approx(expected_df['values'].tolist())
+    assert actual_df['grant_count'].tolist() == expected_df['grant_count'].tolist()
+
+
+def test_selection_summary_matches_pandas(exports):
+    processed_df, grants_path, source_version = exports
+    # every fifth node still reaches all four depths, since the hierarchy is ordered by depth
+    node_ids = build_plotly_hierarchy(processed_df)['ids'].tolist()[::5]
+
+    for selected_path in [None, 'International/Global/Special'] + node_ids:
+        filtered_df = filter_data_by_selection(processed_df, selected_path)
+        expected = summarize_selection(filtered_df)
+        actual = summarize_selection_duckdb(grants_path, source_version, selected_path)
+
+        assert actual['total_amount'] == pytest.approx(expected['total_amount']), selected_path
+        assert actual['total_grants'] == expected['total_grants'], selected_path
+        assert actual['avg_grant'] == pytest.approx(expected['avg_grant'], nan_ok=True), selected_path
+        assert actual['unique_entities'] == expected['unique_entities'], selected_path
+        # ties make the order of equal amounts arbitrary, so compare the amounts
+        assert actual['top_entities'].tolist() == pytest.approx(expected['top_entities'].tolist()), selected_path
+        assert actual['top_program_officers'].tolist() == pytest.approx(expected['top_program_officers'].tolist()), selected_path
+
+
+def test_pages_cover_the_selection(exports):
+    processed_df, grants_path, source_version = exports
+    selected_path = 'International/Africa'
+    expected_df = filter_data_by_selection(processed_df, selected_path)
+
+    pages = []
+    while not pages or len(pages[-1]) == 100:
+        pages.append(load_selection_page_duckdb(grants_path, source_version, selected_path, len(pages) + 1, page_size=100))
+    rows_df = pd.concat(pages)
+
+    assert sorted(rows_df['Geographical Area Served: Geographical Area Served Name']) == \
+        sorted(expected_df['Geographical Area Served: Geographical Area Served Name'])
+    assert rows_df['amount'].sum() == pytest.approx(expected_df['amount'].sum())
+
+
+def test_csv_is_staged_once(tmp_path, grants_cache_dir):
+    grants_path = tmp_path / 'once.csv'
+    grants_path.write_text(SAMPLE_EXPORT.read_text())
+    source_version = get_source_version(grants_path)
+
+    staged_path, _ = stage_grants_source(str(grants_path), source_version)
+    assert Path(staged_path).parent == grants_cache_dir
+    staged_mtime = os.path.getmtime(staged_path)
+
+    # a later run (or a cache miss) for the same file version reuses the Parquet file
+    assert stage_grants_source(str(grants_path), source_version)[0] == staged_path
+    assert os.path.getmtime(staged_path) == staged_mtime
+
+
+def test_replaced_file_with_same_mtime_is_restaged(tmp_path):
+    grants_path = tmp_path / 'replaced.csv'
+    grants_path.write_text(SAMPLE_EXPORT.read_text())
+    first_version = get_source_version(grants_path)
+    before_df = build_plotly_hierarchy_duckdb(str(grants_path), first_version)
+
+    # what cp -p or rsync -a leaves behind: new contents, old mtime
+    grants_path.write_text(SAMPLE_EXPORT.read_text() + '2023-5001,GAS-0028,Kenya,1000,A. Alvarez\n')
+    os.utime(grants_path, ns=(first_version[0], first_version[0]))
+    second_version = get_source_version(grants_path)
+    assert second_version[0] == first_version[0]
+
+    after_df = build_plotly_hierarchy_duckdb(str(grants_path), second_version)
+    assert after_df['values'].sum() == before_df['values'].sum() + 1000 * 4  # Kenya counts at all four levels
+
+
+def test_deleted_staged_copy_is_rebuilt(tmp_path):
+    grants_path = tmp_path / 'deleted.csv'
+    grants_path.write_text(SAMPLE_EXPORT.read_text())
+    source_version = get_source_version(grants_path)
+
+    # goes through the cached staging, as the app does
+    expected_df = build_plotly_hierarchy_duckdb(str(grants_path), source_version)
+    staged_path, _ = app.stage_grants_source(str(grants_path), source_version)
+    os.remove(staged_path)
+
+    actual_df = build_plotly_hierarchy_duckdb(str(grants_path), source_version)
+    assert os.path.exists(staged_path)
+    assert actual_df['values'].tolist() == expected_df['values'].tolist()
+
+
+def test_default_cache_dir_is_private(tmp_path, monkeypatch):
+    monkeypatch.delenv('GRANTS_CACHE_DIR')
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+
+    cache_dir = get_grants_cache_dir()
+    assert Path(cache_dir).parent == tmp_path
+    assert os.stat(cache_dir).st_mode & 0o777 == 0o700
+
+    # a folder left open to others (or made by someone else) is not used
+    os.chmod(cache_dir, 0o777)
+    with pytest.raises(PermissionError):
+        get_grants_cache_dir()
+
+
+def test_late_decimal_amount_is_not_rounded(tmp_path):
+    # enough whole amounts that a sampled type guess would settle on an integer column
+    grants_df = pd.DataFrame({
+        'Request: Reference Number': [f"2000-{i}" for i in range(30_001)],
+        'Geographical Area Served: Geographical Area Served Name': [f"GAS-{i}" for i in range(30_001)],
+        'Geographic Entity': 'Kenya',
+        'Request: Amount': ['1000'] * 30_000 + ['1500.40'],
+        'Request: PO': 'A. Alvarez',
+    })
+    grants_path = tmp_path / 'late_decimal.csv'
+    grants_df.to_csv(grants_path, index=False)
+
+    expected_df = build_plotly_hierarchy(load_and_process_data(grants_path))
+    actual_df = build_plotly_hierarchy_duckdb(str(grants_path), get_source_version(grants_path))
+
+    # the default relative tolerance would hide a lost 40 cents on a total this size
+    assert actual_df['values'].tolist() == pytest.approx(expected_df['values'].tolist(), rel=0, abs=1e-6)
+    assert actual_df.loc[actual_df['ids'] == 'International', 'values'].item() == pytest.approx(30_001_500.40, rel=0, abs=1e-6)
+
+
+def test_non_numeric_amount_is_reported(tmp_path):
+    grants_path = tmp_path / 'bad_amount.csv'
+    grants_path.write_text(SAMPLE_EXPORT.read_text() + '2023-5001,GAS-0028,Kenya,TBD,A. Alvarez\n')
+
+    with pytest.raises(ValueError, match="Request: Amount"):
+        build_plotly_hierarchy_duckdb(str(grants_path), get_source_version(grants_path))
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.parquet'])
+def test_export_columns_named_like_derived_ones(tmp_path, suffix):
+    grants_df = pd.read_csv(SAMPLE_EXPORT)
+    expected_df = build_plotly_hierarchy(load_and_process_data(SAMPLE_EXPORT))
+
+    # columns an export might plausibly carry that share names with the ones the view adds
+    grants_df['amount'] = -1
+    grants_df['level1'] = 'Elsewhere'
+    grants_path = tmp_path / f"clashing{suffix}"
+    if suffix == '.parquet':
+        grants_df.to_parquet(grants_path)
+    else:
+        grants_df.to_csv(grants_path, index=False)
+
+    actual_df = build_plotly_hierarchy_duckdb(str(grants_path), get_source_version(grants_path))
+    assert actual_df['ids'].tolist() == expected_df['ids'].tolist()
+    assert actual_df['values'].tolist() == pytest.approx(expected_df['values'].tolist(), rel=0, abs=1e-6)
@@ -0,0 +1,58 @@
+"""
+Golden-output tests against a fixed sample export.
+If a change to the classification is intentional, regenerate the expected files with
+    UPDATE_GOLDEN=1 python -m pytest tests/test_golden.py
+and review the diff before committing.
+"""
+import os
+from io import StringIO
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from pipeline_helpers import build_plotly_hierarchy, filter_data_by_selection, load_and_process_data
+
+DATA_DIR = Path(__file__).parent / 'data'
+SAMPLE_EXPORT = DATA_DIR / 'sample_export.csv'
+EXPECTED_PROCESSED = DATA_DIR / 'expected_processed.csv'
+EXPECTED_HIERARCHY = DATA_DIR / 'expected_hierarchy.csv'
+
+PROCESSED_COLUMNS = [
+    'Request: Reference Number', 'Geographic Entity', 'level1', 'level2', 'level3', 'level4', 'amount'
+]
+
+
+def check_golden(actual_df, expected_path):
+    if os.environ.get('UPDATE_GOLDEN'):
+        actual_df.to_csv(expected_path, index=False)
+
+    # round-trip through csv so both sides get the same dtypes and missing-value handling
+    expected_df = pd.read_csv(expected_path)
+    actual_df = pd.read_csv(StringIO(actual_df.to_csv(index=False)))
+    pd.testing.assert_frame_equal(actual_df, expected_df)
+
+
+@pytest.fixture(scope='module')
+def processed_df():
+    return load_and_process_data(SAMPLE_EXPORT)
+
+
+def test_processed_matches_golden(processed_df):
+    check_golden(processed_df[PROCESSED_COLUMNS], EXPECTED_PROCESSED)
+
+
+def test_hierarchy_matches_golden(processed_df):
+    check_golden(build_plotly_hierarchy(processed_df), EXPECTED_HIERARCHY)
+
+
+@pytest.mark.parametrize('selected_path, expected_refs', [
+    ('United States/Federal/National/West', ['2019-1002', '2019-1002']),
+    ('International/Africa/Eastern Africa', ['2020-2001', '2020-2001', '2020-2004']),
+    ('International/Global/Special', ['2022-4003', '2022-4004']),
+    ('International/Global/Special/International', []),
+    ('International/Oceania/Melanesia/Fiji', ['2022-4006']),
+])
+def test_selection_rows(processed_df, selected_path, expected_refs):
+    filtered_df = filter_data_by_selection(processed_df, selected_path)
+    assert filtered_df['Request: Reference Number'].tolist() == expected_refs
@@ -0,0 +1,42 @@
+"""
+The sidebar path box may only reach exports inside GRANTS_DATA_DIR
+"""
+import os
+
+import pytest
+
+from pipeline_helpers import resolve_grants_path
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    data_dir = tmp_path / 'exports'
+    data_dir.mkdir()
+    (data_dir / 'grants.csv').write_text('Geographic Entity\n')
+    (data_dir / 'notes.txt').write_text('not an export\n')
+    (tmp_path / 'outside.csv').write_text('Geographic Entity\n')
+    monkeypatch.setenv('GRANTS_DATA_DIR', str(data_dir))
+    return data_dir
+
+
+def test_export_in_data_dir(data_dir):
+    expected = os.path.realpath(data_dir / 'grants.csv')
+    assert resolve_grants_path('grants.csv') == expected
+    assert resolve_grants_path(str(data_dir / 'grants.csv')) == expected
+
+
+@pytest.mark.parametrize('grants_path', [
+    '/etc/passwd', '../outside.csv', 'missing.csv', 'notes.txt', '.', 'link.csv'
+])
+def test_rejects_everything_else(data_dir, grants_path):
+    os.symlink(data_dir.parent / 'outside.csv', data_dir / 'link.csv')
+
+    with pytest.raises(ValueError, match='Export not found'):
+        resolve_grants_path(grants_path)
+
+
+def test_disabled_without_data_dir(monkeypatch):
+    monkeypatch.delenv('GRANTS_DATA_DIR', raising=False)
+
+    with pytest.raises(ValueError, match='not enabled'):
+        resolve_grants_path('grants.csv')
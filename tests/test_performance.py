@@ -0,0 +1,92 @@
+"""
+Throughput budgets for each pipeline stage on the synthetic large dataset.
+Budgets are rows per second and sit well below what a laptop achieves, so a failure means a real
+regression rather than noise. On slower CI runners scale them down with PERF_BUDGET_SCALE=0.5.
+"""
+import os
+import time
+from io import StringIO
+
+import pytest
+
+from pipeline_helpers import (
+    build_plotly_hierarchy, build_plotly_hierarchy_duckdb, filter_data_by_selection, load_and_process_data,
+    stage_grants_source, summarize_selection_duckdb
+)
+
+pytestmark = pytest.mark.perf
+
+MIN_ROWS_PER_SECOND = {
+    'load_and_process_data': 5_000,
+    'build_plotly_hierarchy': 200_000,
+    'filter_data_by_selection': 200_000,
+    # one-off csv to parquet conversion, so compare with the pandas load rather than its group-by
+    'stage_grants_source': 100_000,
+    # these run on every click, over the staged parquet
+    'build_plotly_hierarchy_duckdb': 150_000,
+    'summarize_selection_duckdb': 300_000,
+}
+BUDGET_SCALE = float(os.environ.get('PERF_BUDGET_SCALE', '1'))
+REPEATS = 2
+
+
+def best_time(func, *args):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def check_budget(stage, n_rows, seconds):
+    rows_per_second = n_rows / seconds
+    budget = MIN_ROWS_PER_SECOND[stage] * BUDGET_SCALE
+    assert rows_per_second >= budget, f"{stage}: {rows_per_second:,.0f} rows/s is below the budget of {budget:,.0f}"
+
+
+@pytest.fixture(scope='module')
+def processed_large(synthetic_large):
+    return load_and_process_data(StringIO(synthetic_large))
+
+
+def test_load_and_process_throughput(synthetic_large, processed_large):
+    seconds, _ = best_time(lambda: load_and_process_data(StringIO(synthetic_large)))
+    check_budget('load_and_process_data', len(processed_large), seconds)
+
+
+def test_build_hierarchy_throughput(processed_large):
+    seconds, _ = best_time(build_plotly_hierarchy, processed_large)
+    check_budget('build_plotly_hierarchy', len(processed_large), seconds)
+
+
+def test_filter_throughput(processed_large):
+    # every node is a possible click, so time a full sweep over the chart
+    node_ids = build_plotly_hierarchy(processed_large)['ids'].tolist()
+    seconds, _ = best_time(lambda: [filter_data_by_selection(processed_large, node_id) for node_id in node_ids])
+    check_budget('filter_data_by_selection', len(processed_large) * len(node_ids), seconds)
+
+
+@pytest.fixture(scope='module')
+def large_export_path(synthetic_large, tmp_path_factory):
+    pytest.importorskip('duckdb')
+    grants_path = tmp_path_factory.mktemp('large') / 'synthetic_large.csv'
+    grants_path.write_text(synthetic_large)
+    return str(grants_path)
+
+
+def test_duckdb_staging_throughput(large_export_path, processed_large):
+    # a distinct version per call forces a fresh conversion each time
+    versions = iter(range(REPEATS))
+    seconds, _ = best_time(lambda: stage_grants_source(large_export_path, f"perf-{next(versions)}"))
+    check_budget('stage_grants_source', len(processed_large), seconds)
+
+
+def test_duckdb_hierarchy_throughput(large_export_path, processed_large):
+    seconds, _ = best_time(build_plotly_hierarchy_duckdb, large_export_path, 'perf')
+    check_budget('build_plotly_hierarchy_duckdb', len(processed_large), seconds)
+
+
+def test_duckdb_summary_throughput(large_export_path, processed_large):
+    seconds, _ = best_time(summarize_selection_duckdb, large_export_path, 'perf', 'International/Africa')
+    check_budget('summarize_selection_duckdb', len(processed_large), seconds)
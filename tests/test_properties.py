@@ -0,0 +1,62 @@
+"""
+Invariants that must hold for any export, checked over a spread of seeded synthetic exports
+"""
+from io import StringIO
+
+import pytest
+
+from pipeline_helpers import build_plotly_hierarchy, filter_data_by_selection, load_and_process_data, make_grants_csv, terminal_amount
+
+SEEDS = range(8)
+
+
+@pytest.fixture(scope='module', params=SEEDS)
+def pipeline(request):
+    processed_df = load_and_process_data(StringIO(make_grants_csv(2_000, seed=request.param)))
+    hierarchy_df = build_plotly_hierarchy(processed_df)
+    return processed_df, hierarchy_df
+
+
+def test_ids_are_unique(pipeline):
+    _, hierarchy_df = pipeline
+    assert hierarchy_df['ids'].is_unique
+
+
+def test_every_parent_is_a_node(pipeline):
+    _, hierarchy_df = pipeline
+    parents = set(hierarchy_df['parents']) - {''}
+    assert parents <= set(hierarchy_df['ids'])
+
+
+def test_roots_add_up_to_portfolio_total(pipeline):
+    processed_df, hierarchy_df = pipeline
+    roots = hierarchy_df[hierarchy_df['parents'] == '']
+    assert roots['values'].sum() == pytest.approx(processed_df['amount'].sum())
+    assert roots['grant_count'].sum() == processed_df['Request: Reference Number'].count()
+
+
+def test_node_value_is_sum_of_children(pipeline):
+    # grants classified no deeper than a node (e.g. 'Asia' with no sub-region) count towards it
+    # but towards none of its children, so those are added back before comparing
+    processed_df, hierarchy_df = pipeline
+    child_totals = hierarchy_df.groupby('parents')['values'].sum()
+
+    for _, node in hierarchy_df.iterrows():
+        children = child_totals.get(node['ids'], 0)
+        assert node['values'] == pytest.approx(children + terminal_amount(processed_df, node['ids'])), node['ids']
+        assert node['values'] >= children - 1e-6, node['ids']
+
+
+def test_filtered_total_matches_node(pipeline):
+    processed_df, hierarchy_df = pipeline
+
+    for _, node in hierarchy_df.iterrows():
+        filtered_df = filter_data_by_selection(processed_df, node['ids'])
+        assert filtered_df['amount'].sum() == pytest.approx(node['values']), node['ids']
+        assert filtered_df['Request: Reference Number'].count() == node['grant_count'], node['ids']
+
+
+def test_empty_selection_returns_everything(pipeline):
+    processed_df, _ = pipeline
+    assert filter_data_by_selection(processed_df, None) is processed_df
+    assert filter_data_by_selection(processed_df, '') is processed_df